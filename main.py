@@ -67,6 +67,12 @@ def demo_rsa():
         
         print(f"Decrypted Bytes: {decrypted_bytes.hex()}")
         print(f"Decrypted Message: '{decrypted_str}'")
+
+        # --- Decryption (CRT) ---
+        print("\nDecrypting with private key (Chinese Remainder Theorem)...")
+        decrypted_crt_bytes = rsa.decrypt_crt(key_pair.crt_private_key, ciphertext)
+        print(f"Decrypted Bytes: {decrypted_crt_bytes.hex()}")
+        print(f"Matches standard decryption: {decrypted_crt_bytes == decrypted_bytes}")
         
         # --- Verification ---
         if decrypted_str == message_str:
@@ -0,0 +1,260 @@
+/*
+ * Native AES block functions for src/aes.py.
+ *
+ * A portable C version of the T-table cipher in src/aes.py (no AES-NI).
+ * The key schedule is still expanded in Python: encrypt_block/decrypt_block
+ * take the round keys packed as big-endian 32-bit words, 16 bytes per
+ * round. The decryption schedule is the one for the "equivalent inverse
+ * cipher" (reversed, with InvMixColumns applied to the middle round keys).
+ *
+ * This module is optional: src/aes.py uses its pure-Python rounds when the
+ * extension has not been built. To build it in place:
+ *
+ *     gcc -O3 -shared -fPIC $(python3-config --includes) \
+ *         src/_aes_core.c -o src/_aes_core$(python3-config --extension-suffix)
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+
+/* S-box and inverse S-box (see src/aes_common.py) */
+static const uint8_t S_BOX[256] = {
+    0x63, 0x7c, 0x77, 0x7b, 0xf2, 0x6b, 0x6f, 0xc5, 0x30, 0x01, 0x67, 0x2b, 0xfe, 0xd7, 0xab, 0x76,
+    0xca, 0x82, 0xc9, 0x7d, 0xfa, 0x59, 0x47, 0xf0, 0xad, 0xd4, 0xa2, 0xaf, 0x9c, 0xa4, 0x72, 0xc0,
+    0xb7, 0xfd, 0x93, 0x26, 0x36, 0x3f, 0xf7, 0xcc, 0x34, 0xa5, 0xe5, 0xf1, 0x71, 0xd8, 0x31, 0x15,
+    0x04, 0xc7, 0x23, 0xc3, 0x18, 0x96, 0x05, 0x9a, 0x07, 0x12, 0x80, 0xe2, 0xeb, 0x27, 0xb2, 0x75,
+    0x09, 0x83, 0x2c, 0x1a, 0x1b, 0x6e, 0x5a, 0xa0, 0x52, 0x3b, 0xd6, 0xb3, 0x29, 0xe3, 0x2f, 0x84,
+    0x53, 0xd1, 0x00, 0xed, 0x20, 0xfc, 0xb1, 0x5b, 0x6a, 0xcb, 0xbe, 0x39, 0x4a, 0x4c, 0x58, 0xcf,
+    0xd0, 0xef, 0xaa, 0xfb, 0x43, 0x4d, 0x33, 0x85, 0x45, 0xf9, 0x02, 0x7f, 0x50, 0x3c, 0x9f, 0xa8,
+    0x51, 0xa3, 0x40, 0x8f, 0x92, 0x9d, 0x38, 0xf5, 0xbc, 0xb6, 0xda, 0x21, 0x10, 0xff, 0xf3, 0xd2,
+    0xcd, 0x0c, 0x13, 0xec, 0x5f, 0x97, 0x44, 0x17, 0xc4, 0xa7, 0x7e, 0x3d, 0x64, 0x5d, 0x19, 0x73,
+    0x60, 0x81, 0x4f, 0xdc, 0x22, 0x2a, 0x90, 0x88, 0x46, 0xee, 0xb8, 0x14, 0xde, 0x5e, 0x0b, 0xdb,
+    0xe0, 0x32, 0x3a, 0x0a, 0x49, 0x06, 0x24, 0x5c, 0xc2, 0xd3, 0xac, 0x62, 0x91, 0x95, 0xe4, 0x79,
+    0xe7, 0xc8, 0x37, 0x6d, 0x8d, 0xd5, 0x4e, 0xa9, 0x6c, 0x56, 0xf4, 0xea, 0x65, 0x7a, 0xae, 0x08,
+    0xba, 0x78, 0x25, 0x2e, 0x1c, 0xa6, 0xb4, 0xc6, 0xe8, 0xdd, 0x74, 0x1f, 0x4b, 0xbd, 0x8b, 0x8a,
+    0x70, 0x3e, 0xb5, 0x66, 0x48, 0x03, 0xf6, 0x0e, 0x61, 0x35, 0x57, 0xb9, 0x86, 0xc1, 0x1d, 0x9e,
+    0xe1, 0xf8, 0x98, 0x11, 0x69, 0xd9, 0x8e, 0x94, 0x9b, 0x1e, 0x87, 0xe9, 0xce, 0x55, 0x28, 0xdf,
+    0x8c, 0xa1, 0x89, 0x0d, 0xbf, 0xe6, 0x42, 0x68, 0x41, 0x99, 0x2d, 0x0f, 0xb0, 0x54, 0xbb, 0x16,
+};
+
+static const uint8_t INV_S_BOX[256] = {
+    0x52, 0x09, 0x6a, 0xd5, 0x30, 0x36, 0xa5, 0x38, 0xbf, 0x40, 0xa3, 0x9e, 0x81, 0xf3, 0xd7, 0xfb,
+    0x7c, 0xe3, 0x39, 0x82, 0x9b, 0x2f, 0xff, 0x87, 0x34, 0x8e, 0x43, 0x44, 0xc4, 0xde, 0xe9, 0xcb,
+    0x54, 0x7b, 0x94, 0x32, 0xa6, 0xc2, 0x23, 0x3d, 0xee, 0x4c, 0x95, 0x0b, 0x42, 0xfa, 0xc3, 0x4e,
+    0x08, 0x2e, 0xa1, 0x66, 0x28, 0xd9, 0x24, 0xb2, 0x76, 0x5b, 0xa2, 0x49, 0x6d, 0x8b, 0xd1, 0x25,
+    0x72, 0xf8, 0xf6, 0x64, 0x86, 0x68, 0x98, 0x16, 0xd4, 0xa4, 0x5c, 0xcc, 0x5d, 0x65, 0xb6, 0x92,
+    0x6c, 0x70, 0x48, 0x50, 0xfd, 0xed, 0xb9, 0xda, 0x5e, 0x15, 0x46, 0x57, 0xa7, 0x8d, 0x9d, 0x84,
+    0x90, 0xd8, 0xab, 0x00, 0x8c, 0xbc, 0xd3, 0x0a, 0xf7, 0xe4, 0x58, 0x05, 0xb8, 0xb3, 0x45, 0x06,
+    0xd0, 0x2c, 0x1e, 0x8f, 0xca, 0x3f, 0x0f, 0x02, 0xc1, 0xaf, 0xbd, 0x03, 0x01, 0x13, 0x8a, 0x6b,
+    0x3a, 0x91, 0x11, 0x41, 0x4f, 0x67, 0xdc, 0xea, 0x97, 0xf2, 0xcf, 0xce, 0xf0, 0xb4, 0xe6, 0x73,
+    0x96, 0xac, 0x74, 0x22, 0xe7, 0xad, 0x35, 0x85, 0xe2, 0xf9, 0x37, 0xe8, 0x1c, 0x75, 0xdf, 0x6e,
+    0x47, 0xf1, 0x1a, 0x71, 0x1d, 0x29, 0xc5, 0x89, 0x6f, 0xb7, 0x62, 0x0e, 0xaa, 0x18, 0xbe, 0x1b,
+    0xfc, 0x56, 0x3e, 0x4b, 0xc6, 0xd2, 0x79, 0x20, 0x9a, 0xdb, 0xc0, 0xfe, 0x78, 0xcd, 0x5a, 0xf4,
+    0x1f, 0xdd, 0xa8, 0x33, 0x88, 0x07, 0xc7, 0x31, 0xb1, 0x12, 0x10, 0x59, 0x27, 0x80, 0xec, 0x5f,
+    0x60, 0x51, 0x7f, 0xa9, 0x19, 0xb5, 0x4a, 0x0d, 0x2d, 0xe5, 0x7a, 0x9f, 0x93, 0xc9, 0x9c, 0xef,
+    0xa0, 0xe0, 0x3b, 0x4d, 0xae, 0x2a, 0xf5, 0xb0, 0xc8, 0xeb, 0xbb, 0x3c, 0x83, 0x53, 0x99, 0x61,
+    0x17, 0x2b, 0x04, 0x7e, 0xba, 0x77, 0xd6, 0x26, 0xe1, 0x69, 0x14, 0x63, 0x55, 0x21, 0x0c, 0x7d,
+};
+
+/* T-tables, filled in once at import by init_tables() */
+static uint32_t Te0[256], Te1[256], Te2[256], Te3[256];
+static uint32_t Td0[256], Td1[256], Td2[256], Td3[256];
+
+/* GF(2^8) multiplication (same as gmul in src/aes_common.py) */
+static uint8_t gmul(uint8_t a, uint8_t b)
+{
+    uint8_t p = 0;
+    while (b) {
+        if (b & 1)
+            p ^= a;
+        a = (uint8_t)((a << 1) ^ ((a & 0x80) ? 0x1b : 0));
+        b >>= 1;
+    }
+    return p;
+}
+
+#define ROTR8(x) (((x) >> 8) | ((x) << 24))
+
+static void init_tables(void)
+{
+    int x;
+    for (x = 0; x < 256; x++) {
+        uint8_t s = S_BOX[x], is = INV_S_BOX[x];
+
+        /* MixColumns column (2, 1, 1, 3) times S[x] */
+        Te0[x] = ((uint32_t)gmul(s, 2) << 24) | ((uint32_t)s << 16) |
+                 ((uint32_t)s << 8) | gmul(s, 3);
+        Te1[x] = ROTR8(Te0[x]);
+        Te2[x] = ROTR8(Te1[x]);
+        Te3[x] = ROTR8(Te2[x]);
+
+        /* InvMixColumns column (0x0E, 0x09, 0x0D, 0x0B) times INV_S[x] */
+        Td0[x] = ((uint32_t)gmul(is, 0x0e) << 24) | ((uint32_t)gmul(is, 0x09) << 16) |
+                 ((uint32_t)gmul(is, 0x0d) << 8) | gmul(is, 0x0b);
+        Td1[x] = ROTR8(Td0[x]);
+        Td2[x] = ROTR8(Td1[x]);
+        Td3[x] = ROTR8(Td2[x]);
+    }
+}
+
+static inline uint32_t load_be32(const uint8_t *p)
+{
+    return ((uint32_t)p[0] << 24) | ((uint32_t)p[1] << 16) |
+           ((uint32_t)p[2] << 8) | (uint32_t)p[3];
+}
+
+static inline void store_be32(uint8_t *p, uint32_t x)
+{
+    p[0] = (uint8_t)(x >> 24);
+    p[1] = (uint8_t)(x >> 16);
+    p[2] = (uint8_t)(x >> 8);
+    p[3] = (uint8_t)x;
+}
+
+static void encrypt(const uint8_t in[16], const uint8_t *rk, int nr, uint8_t out[16])
+{
+    uint32_t s0, s1, s2, s3, t0, t1, t2, t3;
+    int r;
+
+    /* Initial AddRoundKey */
+    s0 = load_be32(in) ^ load_be32(rk);
+    s1 = load_be32(in + 4) ^ load_be32(rk + 4);
+    s2 = load_be32(in + 8) ^ load_be32(rk + 8);
+    s3 = load_be32(in + 12) ^ load_be32(rk + 12);
+
+    /* Main rounds: SubBytes + ShiftRows + MixColumns via the Te tables */
+    for (r = 1; r < nr; r++) {
+        rk += 16;
+        t0 = Te0[s0 >> 24] ^ Te1[(s1 >> 16) & 0xff] ^ Te2[(s2 >> 8) & 0xff] ^ Te3[s3 & 0xff] ^ load_be32(rk);
+        t1 = Te0[s1 >> 24] ^ Te1[(s2 >> 16) & 0xff] ^ Te2[(s3 >> 8) & 0xff] ^ Te3[s0 & 0xff] ^ load_be32(rk + 4);
+        t2 = Te0[s2 >> 24] ^ Te1[(s3 >> 16) & 0xff] ^ Te2[(s0 >> 8) & 0xff] ^ Te3[s1 & 0xff] ^ load_be32(rk + 8);
+        t3 = Te0[s3 >> 24] ^ Te1[(s0 >> 16) & 0xff] ^ Te2[(s1 >> 8) & 0xff] ^ Te3[s2 & 0xff] ^ load_be32(rk + 12);
+        s0 = t0; s1 = t1; s2 = t2; s3 = t3;
+    }
+
+    /* Final round (no MixColumns) with the plain S-box */
+    rk += 16;
+    store_be32(out, (((uint32_t)S_BOX[s0 >> 24] << 24) | ((uint32_t)S_BOX[(s1 >> 16) & 0xff] << 16) |
+                     ((uint32_t)S_BOX[(s2 >> 8) & 0xff] << 8) | S_BOX[s3 & 0xff]) ^ load_be32(rk));
+    store_be32(out + 4, (((uint32_t)S_BOX[s1 >> 24] << 24) | ((uint32_t)S_BOX[(s2 >> 16) & 0xff] << 16) |
+                         ((uint32_t)S_BOX[(s3 >> 8) & 0xff] << 8) | S_BOX[s0 & 0xff]) ^ load_be32(rk + 4));
+    store_be32(out + 8, (((uint32_t)S_BOX[s2 >> 24] << 24) | ((uint32_t)S_BOX[(s3 >> 16) & 0xff] << 16) |
+                         ((uint32_t)S_BOX[(s0 >> 8) & 0xff] << 8) | S_BOX[s1 & 0xff]) ^ load_be32(rk + 8));
+    store_be32(out + 12, (((uint32_t)S_BOX[s3 >> 24] << 24) | ((uint32_t)S_BOX[(s0 >> 16) & 0xff] << 16) |
+                          ((uint32_t)S_BOX[(s1 >> 8) & 0xff] << 8) | S_BOX[s2 & 0xff]) ^ load_be32(rk + 12));
+}
+
+static void decrypt(const uint8_t in[16], const uint8_t *rk, int nr, uint8_t out[16])
+{
+    uint32_t s0, s1, s2, s3, t0, t1, t2, t3;
+    int r;
+
+    /* Initial AddRoundKey */
+    s0 = load_be32(in) ^ load_be32(rk);
+    s1 = load_be32(in + 4) ^ load_be32(rk + 4);
+    s2 = load_be32(in + 8) ^ load_be32(rk + 8);
+    s3 = load_be32(in + 12) ^ load_be32(rk + 12);
+
+    /* Main rounds: InvSubBytes + InvShiftRows + InvMixColumns via the Td tables */
+    for (r = 1; r < nr; r++) {
+        rk += 16;
+        t0 = Td0[s0 >> 24] ^ Td1[(s3 >> 16) & 0xff] ^ Td2[(s2 >> 8) & 0xff] ^ Td3[s1 & 0xff] ^ load_be32(rk);
+        t1 = Td0[s1 >> 24] ^ Td1[(s0 >> 16) & 0xff] ^ Td2[(s3 >> 8) & 0xff] ^ Td3[s2 & 0xff] ^ load_be32(rk + 4);
+        t2 = Td0[s2 >> 24] ^ Td1[(s1 >> 16) & 0xff] ^ Td2[(s0 >> 8) & 0xff] ^ Td3[s3 & 0xff] ^ load_be32(rk + 8);
+        t3 = Td0[s3 >> 24] ^ Td1[(s2 >> 16) & 0xff] ^ Td2[(s1 >> 8) & 0xff] ^ Td3[s0 & 0xff] ^ load_be32(rk + 12);
+        s0 = t0; s1 = t1; s2 = t2; s3 = t3;
+    }
+
+    /* Final round (no InvMixColumns) with the plain inverse S-box */
+    rk += 16;
+    store_be32(out, (((uint32_t)INV_S_BOX[s0 >> 24] << 24) | ((uint32_t)INV_S_BOX[(s3 >> 16) & 0xff] << 16) |
+                     ((uint32_t)INV_S_BOX[(s2 >> 8) & 0xff] << 8) | INV_S_BOX[s1 & 0xff]) ^ load_be32(rk));
+    store_be32(out + 4, (((uint32_t)INV_S_BOX[s1 >> 24] << 24) | ((uint32_t)INV_S_BOX[(s0 >> 16) & 0xff] << 16) |
+                         ((uint32_t)INV_S_BOX[(s3 >> 8) & 0xff] << 8) | INV_S_BOX[s2 & 0xff]) ^ load_be32(rk + 4));
+    store_be32(out + 8, (((uint32_t)INV_S_BOX[s2 >> 24] << 24) | ((uint32_t)INV_S_BOX[(s1 >> 16) & 0xff] << 16) |
+                         ((uint32_t)INV_S_BOX[(s0 >> 8) & 0xff] << 8) | INV_S_BOX[s3 & 0xff]) ^ load_be32(rk + 8));
+    store_be32(out + 12, (((uint32_t)INV_S_BOX[s3 >> 24] << 24) | ((uint32_t)INV_S_BOX[(s2 >> 16) & 0xff] << 16) |
+                          ((uint32_t)INV_S_BOX[(s1 >> 8) & 0xff] << 8) | INV_S_BOX[s0 & 0xff]) ^ load_be32(rk + 12));
+}
+
+typedef void (*block_fn)(const uint8_t *, const uint8_t *, int, uint8_t *);
+
+/* Parses (block, round_keys), runs fn and returns the 16-byte result */
+static PyObject *
+run_block(PyObject *args, const char *format, block_fn fn)
+{
+    Py_buffer block, round_keys;
+    uint8_t out[16];
+    int nr;
+
+    if (!PyArg_ParseTuple(args, format, &block, &round_keys))
+        return NULL;
+
+    if (block.len != 16) {
+        PyErr_SetString(PyExc_ValueError, "Block must be 16 bytes");
+        goto fail;
+    }
+    /* 11, 13 or 15 round keys of 16 bytes (AES-128/192/256) */
+    if (round_keys.len != 176 && round_keys.len != 208 && round_keys.len != 240) {
+        PyErr_SetString(PyExc_ValueError, "Round keys must be 176, 208, or 240 bytes");
+        goto fail;
+    }
+    nr = (int)(round_keys.len / 16) - 1;
+
+    fn((const uint8_t *)block.buf, (const uint8_t *)round_keys.buf, nr, out);
+
+    PyBuffer_Release(&block);
+    PyBuffer_Release(&round_keys);
+    return PyBytes_FromStringAndSize((const char *)out, 16);
+
+fail:
+    PyBuffer_Release(&block);
+    PyBuffer_Release(&round_keys);
+    return NULL;
+}
+
+PyDoc_STRVAR(encrypt_block_doc,
+"encrypt_block(block, round_keys) -> bytes\n"
+"\n"
+"Encrypts a 16-byte block with an expanded key schedule, packed as\n"
+"big-endian 32-bit words (16 bytes per round key).");
+
+static PyObject *
+aes_encrypt_block(PyObject *self, PyObject *args)
+{
+    return run_block(args, "y*y*:encrypt_block", encrypt);
+}
+
+PyDoc_STRVAR(decrypt_block_doc,
+"decrypt_block(block, round_keys) -> bytes\n"
+"\n"
+"Decrypts a 16-byte block with the equivalent-inverse-cipher key\n"
+"schedule, packed as big-endian 32-bit words (16 bytes per round key).");
+
+static PyObject *
+aes_decrypt_block(PyObject *self, PyObject *args)
+{
+    return run_block(args, "y*y*:decrypt_block", decrypt);
+}
+
+static PyMethodDef aes_core_methods[] = {
+    {"encrypt_block", aes_encrypt_block, METH_VARARGS, encrypt_block_doc},
+    {"decrypt_block", aes_decrypt_block, METH_VARARGS, decrypt_block_doc},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef aes_core_module = {
+    PyModuleDef_HEAD_INIT,
+    "_aes_core",
+    "Native T-table AES block functions.",
+    -1,
+    aes_core_methods
+};
+
+PyMODINIT_FUNC
+PyInit__aes_core(void)
+{
+    init_tables();
+    return PyModule_Create(&aes_core_module);
+}
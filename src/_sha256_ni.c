@@ -0,0 +1,272 @@
+/*
+ * Native SHA-256 compression function for src/sha256.py.
+ *
+ * Uses the Intel SHA Extensions (SHA-NI) when the CPU supports them and
+ * falls back to a portable scalar C loop otherwise. The SHA-NI path follows
+ * Jeffrey Walton's (noloader) public-domain sha256-x86.c.
+ *
+ * This module is optional: src/sha256.py uses its pure-Python compression
+ * loop when the extension has not been built. To build it in place:
+ *
+ *     gcc -O3 -shared -fPIC $(python3-config --includes) \
+ *         src/_sha256_ni.c -o src/_sha256_ni$(python3-config --extension-suffix)
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <string.h>
+
+#if defined(__x86_64__) || defined(__i386__)
+#define HAVE_X86 1
+#include <immintrin.h>
+#endif
+
+/* Round constants K (see src/sha256.py) */
+static const uint32_t K[64] = {
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+};
+
+/* Set once at import time from a CPUID probe */
+static int use_sha_ni = 0;
+
+static inline uint32_t load_be32(const uint8_t *p)
+{
+    return ((uint32_t)p[0] << 24) | ((uint32_t)p[1] << 16) |
+           ((uint32_t)p[2] << 8) | (uint32_t)p[3];
+}
+
+static inline void store_be32(uint8_t *p, uint32_t x)
+{
+    p[0] = (uint8_t)(x >> 24);
+    p[1] = (uint8_t)(x >> 16);
+    p[2] = (uint8_t)(x >> 8);
+    p[3] = (uint8_t)x;
+}
+
+#define ROTR(x, n) (((x) >> (n)) | ((x) << (32 - (n))))
+
+/* Portable fallback: the FIPS 180-4 compression loop, one chunk at a time */
+static void process_scalar(uint32_t h[8], const uint8_t *data, size_t n_chunks)
+{
+    uint32_t w[64];
+
+    while (n_chunks--) {
+        uint32_t a, b, c, d, e, f, g, hh;
+        int i;
+
+        for (i = 0; i < 16; i++)
+            w[i] = load_be32(data + i * 4);
+        for (i = 16; i < 64; i++) {
+            uint32_t s0 = ROTR(w[i-15], 7) ^ ROTR(w[i-15], 18) ^ (w[i-15] >> 3);
+            uint32_t s1 = ROTR(w[i-2], 17) ^ ROTR(w[i-2], 19) ^ (w[i-2] >> 10);
+            w[i] = w[i-16] + s0 + w[i-7] + s1;
+        }
+
+        a = h[0]; b = h[1]; c = h[2]; d = h[3];
+        e = h[4]; f = h[5]; g = h[6]; hh = h[7];
+
+        for (i = 0; i < 64; i++) {
+            uint32_t S1 = ROTR(e, 6) ^ ROTR(e, 11) ^ ROTR(e, 25);
+            uint32_t ch = g ^ (e & (f ^ g));
+            uint32_t temp1 = hh + S1 + ch + K[i] + w[i];
+            uint32_t S0 = ROTR(a, 2) ^ ROTR(a, 13) ^ ROTR(a, 22);
+            uint32_t maj = (a & b) | (c & (a | b));
+            uint32_t temp2 = S0 + maj;
+
+            hh = g; g = f; f = e; e = d + temp1;
+            d = c; c = b; b = a; a = temp1 + temp2;
+        }
+
+        h[0] += a; h[1] += b; h[2] += c; h[3] += d;
+        h[4] += e; h[5] += f; h[6] += g; h[7] += hh;
+        data += 64;
+    }
+}
+
+#ifdef HAVE_X86
+
+/*
+ * Four rounds of SHA-256 on the working state. MSG holds four schedule
+ * words; the K constants for those rounds are added before the two
+ * sha256rnds2 instructions (each of which performs two rounds).
+ */
+#define QUAD_ROUND(msg, k)                                                  \
+    do {                                                                    \
+        MSG = _mm_add_epi32((msg), _mm_loadu_si128((const __m128i *)(k)));  \
+        STATE1 = _mm_sha256rnds2_epu32(STATE1, STATE0, MSG);                \
+        MSG = _mm_shuffle_epi32(MSG, 0x0E);                                 \
+        STATE0 = _mm_sha256rnds2_epu32(STATE0, STATE1, MSG);                \
+    } while (0)
+
+/*
+ * Extends the message schedule by four words: m0 becomes W[i+16..i+19]
+ * given m0..m3 = W[i..i+15].
+ */
+#define SCHEDULE(m0, m1, m2, m3)                                            \
+    do {                                                                    \
+        TMP = _mm_alignr_epi8((m3), (m2), 4);                               \
+        m0 = _mm_sha256msg1_epu32((m0), (m1));                              \
+        m0 = _mm_add_epi32((m0), TMP);                                      \
+        m0 = _mm_sha256msg2_epu32((m0), (m3));                              \
+    } while (0)
+
+__attribute__((target("sha,sse4.1,ssse3")))
+static void process_sha_ni(uint32_t h[8], const uint8_t *data, size_t n_chunks)
+{
+    __m128i STATE0, STATE1, MSG, TMP;
+    __m128i MSG0, MSG1, MSG2, MSG3;
+    __m128i ABEF_SAVE, CDGH_SAVE;
+    const __m128i MASK = _mm_set_epi64x(0x0c0d0e0f08090a0bULL, 0x0405060700010203ULL);
+
+    /* Load the state and rearrange it into the ABEF/CDGH layout */
+    TMP = _mm_loadu_si128((const __m128i *)&h[0]);    /* DCBA */
+    STATE1 = _mm_loadu_si128((const __m128i *)&h[4]); /* HGFE */
+
+    TMP = _mm_shuffle_epi32(TMP, 0xB1);          /* CDAB */
+    STATE1 = _mm_shuffle_epi32(STATE1, 0x1B);    /* EFGH */
+    STATE0 = _mm_alignr_epi8(TMP, STATE1, 8);    /* ABEF */
+    STATE1 = _mm_blend_epi16(STATE1, TMP, 0xF0); /* CDGH */
+
+    while (n_chunks--) {
+        ABEF_SAVE = STATE0;
+        CDGH_SAVE = STATE1;
+
+        /* Load the chunk as big-endian words */
+        MSG0 = _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *)(data + 0)), MASK);
+        MSG1 = _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *)(data + 16)), MASK);
+        MSG2 = _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *)(data + 32)), MASK);
+        MSG3 = _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *)(data + 48)), MASK);
+
+        /* Rounds 0-15 use the message words directly */
+        QUAD_ROUND(MSG0, &K[0]);
+        QUAD_ROUND(MSG1, &K[4]);
+        QUAD_ROUND(MSG2, &K[8]);
+        QUAD_ROUND(MSG3, &K[12]);
+
+        /* Rounds 16-63 extend the schedule four words at a time */
+        SCHEDULE(MSG0, MSG1, MSG2, MSG3); QUAD_ROUND(MSG0, &K[16]);
+        SCHEDULE(MSG1, MSG2, MSG3, MSG0); QUAD_ROUND(MSG1, &K[20]);
+        SCHEDULE(MSG2, MSG3, MSG0, MSG1); QUAD_ROUND(MSG2, &K[24]);
+        SCHEDULE(MSG3, MSG0, MSG1, MSG2); QUAD_ROUND(MSG3, &K[28]);
+        SCHEDULE(MSG0, MSG1, MSG2, MSG3); QUAD_ROUND(MSG0, &K[32]);
+        SCHEDULE(MSG1, MSG2, MSG3, MSG0); QUAD_ROUND(MSG1, &K[36]);
+        SCHEDULE(MSG2, MSG3, MSG0, MSG1); QUAD_ROUND(MSG2, &K[40]);
+        SCHEDULE(MSG3, MSG0, MSG1, MSG2); QUAD_ROUND(MSG3, &K[44]);
+        SCHEDULE(MSG0, MSG1, MSG2, MSG3); QUAD_ROUND(MSG0, &K[48]);
+        SCHEDULE(MSG1, MSG2, MSG3, MSG0); QUAD_ROUND(MSG1, &K[52]);
+        SCHEDULE(MSG2, MSG3, MSG0, MSG1); QUAD_ROUND(MSG2, &K[56]);
+        SCHEDULE(MSG3, MSG0, MSG1, MSG2); QUAD_ROUND(MSG3, &K[60]);
+
+        /* Add this chunk's result to the running state */
+        STATE0 = _mm_add_epi32(STATE0, ABEF_SAVE);
+        STATE1 = _mm_add_epi32(STATE1, CDGH_SAVE);
+        data += 64;
+    }
+
+    /* Rearrange back to H[0..7] order and store */
+    TMP = _mm_shuffle_epi32(STATE0, 0x1B);       /* FEBA */
+    STATE1 = _mm_shuffle_epi32(STATE1, 0xB1);    /* DCHG */
+    STATE0 = _mm_blend_epi16(TMP, STATE1, 0xF0); /* DCBA */
+    STATE1 = _mm_alignr_epi8(STATE1, TMP, 8);    /* ABEF */
+
+    _mm_storeu_si128((__m128i *)&h[0], STATE0);
+    _mm_storeu_si128((__m128i *)&h[4], STATE1);
+}
+
+#endif /* HAVE_X86 */
+
+PyDoc_STRVAR(process_chunks_doc,
+"process_chunks(state, data) -> bytes\n"
+"\n"
+"Runs the SHA-256 compression function over every 64-byte chunk of\n"
+"'data', starting from the 32-byte big-endian hash state 'state'.\n"
+"Returns the updated 32-byte state.");
+
+static PyObject *
+process_chunks(PyObject *self, PyObject *args)
+{
+    Py_buffer state, data;
+    uint32_t h[8];
+    uint8_t out[32];
+    size_t n_chunks;
+    int i;
+
+    if (!PyArg_ParseTuple(args, "y*y*:process_chunks", &state, &data))
+        return NULL;
+
+    if (state.len != 32) {
+        PyErr_SetString(PyExc_ValueError, "State must be 32 bytes");
+        goto fail;
+    }
+    if (data.len % 64 != 0) {
+        PyErr_SetString(PyExc_ValueError, "Data length must be a multiple of 64 bytes");
+        goto fail;
+    }
+
+    for (i = 0; i < 8; i++)
+        h[i] = load_be32((const uint8_t *)state.buf + i * 4);
+    n_chunks = (size_t)data.len / 64;
+
+    Py_BEGIN_ALLOW_THREADS
+#ifdef HAVE_X86
+    if (use_sha_ni)
+        process_sha_ni(h, (const uint8_t *)data.buf, n_chunks);
+    else
+#endif
+        process_scalar(h, (const uint8_t *)data.buf, n_chunks);
+    Py_END_ALLOW_THREADS
+
+    for (i = 0; i < 8; i++)
+        store_be32(out + i * 4, h[i]);
+
+    PyBuffer_Release(&state);
+    PyBuffer_Release(&data);
+    return PyBytes_FromStringAndSize((const char *)out, 32);
+
+fail:
+    PyBuffer_Release(&state);
+    PyBuffer_Release(&data);
+    return NULL;
+}
+
+static PyMethodDef sha256_ni_methods[] = {
+    {"process_chunks", process_chunks, METH_VARARGS, process_chunks_doc},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef sha256_ni_module = {
+    PyModuleDef_HEAD_INIT,
+    "_sha256_ni",
+    "Native SHA-256 compression (SHA-NI with a scalar fallback).",
+    -1,
+    sha256_ni_methods
+};
+
+PyMODINIT_FUNC
+PyInit__sha256_ni(void)
+{
+    PyObject *m = PyModule_Create(&sha256_ni_module);
+    if (m == NULL)
+        return NULL;
+
+#ifdef HAVE_X86
+    __builtin_cpu_init();
+    use_sha_ni = __builtin_cpu_supports("sha") &&
+                 __builtin_cpu_supports("sse4.1") &&
+                 __builtin_cpu_supports("ssse3");
+#endif
+
+    if (PyModule_AddIntConstant(m, "HAVE_SHA_NI", use_sha_ni) < 0) {
+        Py_DECREF(m);
+        return NULL;
+    }
+    return m;
+}
@@ -1,119 +1,68 @@
 # This file implements the AES (Rijndael) block cipher.
 # It supports AES-128, AES-192, and AES-256 by varying the key size.
+#
+# The rounds use the T-table formulation: the state is held as four 32-bit
+# column words, and SubBytes, ShiftRows and MixColumns are fused into table
+# lookups (see TE0..TE3 and TD0..TD3 in aes_common.py).
 
-from src.aes_common import S_BOX, INV_S_BOX, RCON, gmul
+import functools
+import struct
 
-# Type alias for the 4x4 byte state matrix
-State = list[list[int]]
+from src.aes_common import (
+    S_BOX, INV_S_BOX, RCON,
+    TE0, TE1, TE2, TE3, TD0, TD1, TD2, TD3,
+    SUB0, SUB1, SUB2, SUB3,
+)
 
-def _sub_bytes(state: State) -> None:
-    """Applies the S-box to each byte of the state."""
-    for r in range(4):
-        for c in range(4):
-            state[r][c] = S_BOX[state[r][c]]
-
-def _inv_sub_bytes(state: State) -> None:
-    """Applies the inverse S-box to each byte of the state."""
-    for r in range(4):
-        for c in range(4):
-            state[r][c] = INV_S_BOX[state[r][c]]
-
-def _shift_rows(state: State) -> None:
-    """
-    Cyclically shifts the rows of the state.
-    Row 0: no shift
-    Row 1: 1 byte left shift
-    Row 2: 2 bytes left shift
-    Row 3: 3 bytes left shift
-    """
-    # Row 1: [1,0] [1,1] [1,2] [1,3] -> [1,1] [1,2] [1,3] [1,0]
-    state[1][0], state[1][1], state[1][2], state[1][3] = \
-    state[1][1], state[1][2], state[1][3], state[1][0]
-    
-    # Row 2: [2,0] [2,1] [2,2] [2,3] -> [2,2] [2,3] [2,0] [2,1]
-    state[2][0], state[2][1], state[2][2], state[2][3] = \
-    state[2][2], state[2][3], state[2][0], state[2][1]
+# Optional native T-table core (see src/_aes_core.c for build instructions).
+# Without it, encrypt_block/decrypt_block run the rounds in Python.
+try:
+    from src._aes_core import (
+        encrypt_block as _encrypt_block_native,
+        decrypt_block as _decrypt_block_native,
+    )
+except ImportError:
+    _encrypt_block_native = None
+    _decrypt_block_native = None
 
-    # Row 3: [3,0] [3,1] [3,2] [3,3] -> [3,3] [3,0] [3,1] [3,2]
-    state[3][0], state[3][1], state[3][2], state[3][3] = \
-    state[3][3], state[3][0], state[3][1], state[3][2]
+# Optional fast path: OpenSSL's AES (AES-NI where available) through the
+# 'cryptography' package. Only used by encrypt_block_fast/decrypt_block_fast.
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:
+    Cipher = None
 
-def _inv_shift_rows(state: State) -> None:
-    """
-    Inverse of ShiftRows (cyclical right shifts).
-    Row 0: no shift
-    Row 1: 1 byte right shift
-    Row 2: 2 bytes right shift
-    Row 3: 3 bytes right shift
-    """
-    # Row 1: [1,0] [1,1] [1,2] [1,3] -> [1,3] [1,0] [1,1] [1,2]
-    state[1][0], state[1][1], state[1][2], state[1][3] = \
-    state[1][3], state[1][0], state[1][1], state[1][2]
-    
-    # Row 2: [2,0] [2,1] [2,2] [2,3] -> [2,2] [2,3] [2,0] [2,1] (same as left)
-    state[2][0], state[2][1], state[2][2], state[2][3] = \
-    state[2][2], state[2][3], state[2][0], state[2][1]
-
-    # Row 3: [3,0] [3,1] [3,2] [3,3] -> [3,1] [3,2] [3,3] [3,0]
-    state[3][0], state[3][1], state[3][2], state[3][3] = \
-    state[3][1], state[3][2], state[3][3], state[3][0]
-
-def _mix_columns(state: State) -> None:
-    """
-    Performs the MixColumns operation using GF(2^8) multiplication.
-    Each column is multiplied by a fixed matrix:
-    [2 3 1 1]
-    [1 2 3 1]
-    [1 1 2 3]
-    [3 1 1 2]
-    """
-    for c in range(4):
-        # Store original column values
-        s0 = state[0][c]
-        s1 = state[1][c]
-        s2 = state[2][c]
-        s3 = state[3][c]
-        
-        # New column values
-        state[0][c] = gmul(s0, 2) ^ gmul(s1, 3) ^ gmul(s2, 1) ^ gmul(s3, 1)
-        state[1][c] = gmul(s0, 1) ^ gmul(s1, 2) ^ gmul(s2, 3) ^ gmul(s3, 1)
-        state[2][c] = gmul(s0, 1) ^ gmul(s1, 1) ^ gmul(s2, 2) ^ gmul(s3, 3)
-        state[3][c] = gmul(s0, 3) ^ gmul(s1, 1) ^ gmul(s2, 1) ^ gmul(s3, 2)
+# Optional: numpy, used by encrypt_blocks/decrypt_blocks to run the T-table
+# rounds over many blocks at once.
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-def _inv_mix_columns(state: State) -> None:
-    """
-    Inverse of MixColumns.
-    Each column is multiplied by the inverse matrix:
-    [0x0E 0x0B 0x0D 0x09]
-    [0x09 0x0E 0x0B 0x0D]
-    [0x0D 0x09 0x0E 0x0B]
-    [0x0B 0x0D 0x09 0x0E]
-    """
-    for c in range(4):
-        s0 = state[0][c]
-        s1 = state[1][c]
-        s2 = state[2][c]
-        s3 = state[3][c]
+if np is not None:
+    _TE_NP = tuple(np.array(t, dtype=np.uint32) for t in (TE0, TE1, TE2, TE3))
+    _TD_NP = tuple(np.array(t, dtype=np.uint32) for t in (TD0, TD1, TD2, TD3))
+    _S_BOX_NP = np.array(S_BOX, dtype=np.uint32)
+    _INV_S_BOX_NP = np.array(INV_S_BOX, dtype=np.uint32)
 
-        state[0][c] = gmul(s0, 0x0e) ^ gmul(s1, 0x0b) ^ gmul(s2, 0x0d) ^ gmul(s3, 0x09)
-        state[1][c] = gmul(s0, 0x09) ^ gmul(s1, 0x0e) ^ gmul(s2, 0x0b) ^ gmul(s3, 0x0d)
-        state[2][c] = gmul(s0, 0x0d) ^ gmul(s1, 0x09) ^ gmul(s2, 0x0e) ^ gmul(s3, 0x0b)
-        state[3][c] = gmul(s0, 0x0b) ^ gmul(s1, 0x0d) ^ gmul(s2, 0x09) ^ gmul(s3, 0x0e)
+# Type alias for a round key: four 32-bit column words (big-endian bytes)
+RoundKey = tuple[int, int, int, int]
 
-def _add_round_key(state: State, round_key: list[int]) -> None:
+def _inv_mix_column(word: int) -> int:
     """
-    Adds (XORs) the round key to the state.
-    The round key is a 1D list of 16 bytes, applied column by column.
+    Applies InvMixColumns to a single 32-bit column word.
+    The TD tables also include the inverse S-box, so each byte is first
+    passed through the S-box to cancel it out.
     """
-    for c in range(4):
-        for r in range(4):
-            # round_key[c*4 + r] selects the key byte
-            state[r][c] ^= round_key[c*4 + r]
+    return (TD0[S_BOX[word >> 24]] ^
+            TD1[S_BOX[(word >> 16) & 0xFF]] ^
+            TD2[S_BOX[(word >> 8) & 0xFF]] ^
+            TD3[S_BOX[word & 0xFF]])
 
-def _key_expansion(key: bytes) -> list[list[int]]:
+def _key_expansion(key: bytes) -> list[RoundKey]:
     """
     Expands the initial key into a schedule of round keys.
-    Returns a list of 16-byte round keys.
+    Returns a list of round keys, each as four 32-bit column words.
     """
     key_len = len(key)
     if key_len not in [16, 24, 32]:
@@ -122,7 +71,7 @@ def _key_expansion(key: bytes) -> list[list[int]]:
     # Nk = key length in 32-bit words (4, 6, or 8)
     Nk = key_len // 4
     # Nr = number of rounds (10, 12, or 14)
-    Nr = 10 + (Nk - 4) * 2
+    Nr = Nk + 6
     
     # Nb = block size in 32-bit words (always 4 for AES)
     Nb = 4
@@ -138,104 +87,382 @@ def _key_expansion(key: bytes) -> list[list[int]]:
     for i in range(Nk, Nb * (Nr + 1)):
         temp = w[i-1]
         if i % Nk == 0:
-            # Rotate, SubBytes, and Rcon XOR
-            temp = ((temp << 8) & 0xFFFFFF00) | ((temp >> 24) & 0x000000FF) # RotWord
-            
-            # SubWord (apply S-box to each byte)
-            temp_sub = 0
-            temp_sub |= (S_BOX[(temp >> 24) & 0xFF]) << 24
-            temp_sub |= (S_BOX[(temp >> 16) & 0xFF]) << 16
-            temp_sub |= (S_BOX[(temp >> 8)  & 0xFF]) << 8
-            temp_sub |= (S_BOX[ temp        & 0xFF])
-            
-            temp = temp_sub
+            # RotWord, SubWord, and Rcon XOR.
+            # RotWord moves each byte up one position (the top byte wraps to
+            # the bottom), so it is folded into which SUBn table each byte
+            # of the unrotated word is looked up in.
+            temp = (SUB3[(temp >> 16) & 0xFF] |
+                    SUB2[(temp >> 8) & 0xFF] |
+                    SUB1[temp & 0xFF] |
+                    SUB0[temp >> 24])
             
             temp ^= (RCON[i // Nk] << 24)
             
         elif Nk > 6 and (i % Nk == 4):
             # Extra SubWord step for 256-bit keys
-            temp_sub = 0
-            temp_sub |= (S_BOX[(temp >> 24) & 0xFF]) << 24
-            temp_sub |= (S_BOX[(temp >> 16) & 0xFF]) << 16
-            temp_sub |= (S_BOX[(temp >> 8)  & 0xFF]) << 8
-            temp_sub |= (S_BOX[ temp        & 0xFF])
-            temp = temp_sub
+            temp = (SUB3[temp >> 24] |
+                    SUB2[(temp >> 16) & 0xFF] |
+                    SUB1[(temp >> 8) & 0xFF] |
+                    SUB0[temp & 0xFF])
         
         w[i] = w[i - Nk] ^ temp
 
-    # Group the 32-bit words back into 16-byte round keys
+    # Group the 32-bit words into round keys of four words each
     round_keys = []
     for i in range(Nr + 1):
-        round_key = []
-        for j in range(4):
-            word = w[i*4 + j]
-            round_key.extend(word.to_bytes(4, 'big'))
-        round_keys.append(round_key)
+        round_keys.append(tuple(w[i*4 : i*4 + 4]))
         
     return round_keys
 
-def _bytes_to_state(data: bytes) -> State:
-    """Converts a 16-byte block into a 4x4 state (column-major)."""
-    state = [[0] * 4 for _ in range(4)]
-    for r in range(4):
+@functools.lru_cache(maxsize=32)
+def _key_expansion_cached(key: bytes) -> tuple[RoundKey, ...]:
+    """
+    Cached _key_expansion, so encrypting many blocks under one key only
+    expands it once. The schedule is returned as a tuple so the cached
+    value can be shared safely between callers.
+    """
+    return tuple(_key_expansion(key))
+
+@functools.lru_cache(maxsize=32)
+def _inv_key_expansion_cached(key: bytes) -> tuple[RoundKey, ...]:
+    """
+    Round keys for the "equivalent inverse cipher" used by decrypt_block.
+    The schedule is reversed, and InvMixColumns is applied to every round
+    key except the first and last, so that the TD tables can fuse the
+    inverse round steps just like TE does for encryption.
+    """
+    round_keys = _key_expansion_cached(key)
+    Nr = len(round_keys) - 1
+
+    inv_round_keys = [round_keys[Nr]]
+    for i in range(Nr - 1, 0, -1):
+        inv_round_keys.append(tuple(_inv_mix_column(word) for word in round_keys[i]))
+    inv_round_keys.append(round_keys[0])
+
+    return tuple(inv_round_keys)
+
+# Packs/unpacks a 16-byte block as four big-endian 32-bit column words
+_BLOCK_WORDS = struct.Struct('>4I')
+
+def _encrypt_rounds(block: bytes, round_keys: tuple[RoundKey, ...]) -> bytes:
+    """Runs the T-table encryption rounds over one block with a key schedule."""
+    Nr = len(round_keys) - 1 # Number of rounds
+
+    # Load the state as four column words, with the initial AddRoundKey
+    k0, k1, k2, k3 = round_keys[0]
+    s0, s1, s2, s3 = _BLOCK_WORDS.unpack(block)
+    s0 ^= k0
+    s1 ^= k1
+    s2 ^= k2
+    s3 ^= k3
+
+    # Main rounds: SubBytes + ShiftRows + MixColumns via the TE tables.
+    # ShiftRows shows up as column c taking row r from column (c + r) % 4.
+    for i in range(1, Nr):
+        k0, k1, k2, k3 = round_keys[i]
+        s0, s1, s2, s3 = (
+            TE0[s0 >> 24] ^ TE1[(s1 >> 16) & 0xFF] ^ TE2[(s2 >> 8) & 0xFF] ^ TE3[s3 & 0xFF] ^ k0,
+            TE0[s1 >> 24] ^ TE1[(s2 >> 16) & 0xFF] ^ TE2[(s3 >> 8) & 0xFF] ^ TE3[s0 & 0xFF] ^ k1,
+            TE0[s2 >> 24] ^ TE1[(s3 >> 16) & 0xFF] ^ TE2[(s0 >> 8) & 0xFF] ^ TE3[s1 & 0xFF] ^ k2,
+            TE0[s3 >> 24] ^ TE1[(s0 >> 16) & 0xFF] ^ TE2[(s1 >> 8) & 0xFF] ^ TE3[s2 & 0xFF] ^ k3,
+        )
+
+    # Final round (no MixColumns): SubBytes + ShiftRows with the plain S-box
+    k0, k1, k2, k3 = round_keys[Nr]
+    return _BLOCK_WORDS.pack(
+        ((S_BOX[s0 >> 24] << 24) | (S_BOX[(s1 >> 16) & 0xFF] << 16) |
+         (S_BOX[(s2 >> 8) & 0xFF] << 8) | S_BOX[s3 & 0xFF]) ^ k0,
+        ((S_BOX[s1 >> 24] << 24) | (S_BOX[(s2 >> 16) & 0xFF] << 16) |
+         (S_BOX[(s3 >> 8) & 0xFF] << 8) | S_BOX[s0 & 0xFF]) ^ k1,
+        ((S_BOX[s2 >> 24] << 24) | (S_BOX[(s3 >> 16) & 0xFF] << 16) |
+         (S_BOX[(s0 >> 8) & 0xFF] << 8) | S_BOX[s1 & 0xFF]) ^ k2,
+        ((S_BOX[s3 >> 24] << 24) | (S_BOX[(s0 >> 16) & 0xFF] << 16) |
+         (S_BOX[(s1 >> 8) & 0xFF] << 8) | S_BOX[s2 & 0xFF]) ^ k3,
+    )
+
+def _decrypt_rounds(block: bytes, round_keys: tuple[RoundKey, ...]) -> bytes:
+    """
+    Runs the T-table decryption rounds over one block with an inverse key
+    schedule (see _inv_key_expansion_cached).
+    """
+    Nr = len(round_keys) - 1
+
+    # Load the state, with the initial AddRoundKey (last encryption round key)
+    k0, k1, k2, k3 = round_keys[0]
+    s0, s1, s2, s3 = _BLOCK_WORDS.unpack(block)
+    s0 ^= k0
+    s1 ^= k1
+    s2 ^= k2
+    s3 ^= k3
+
+    # Main rounds: InvSubBytes + InvShiftRows + InvMixColumns via the TD
+    # tables. InvShiftRows takes row r of column c from column (c - r) % 4.
+    for i in range(1, Nr):
+        k0, k1, k2, k3 = round_keys[i]
+        s0, s1, s2, s3 = (
+            TD0[s0 >> 24] ^ TD1[(s3 >> 16) & 0xFF] ^ TD2[(s2 >> 8) & 0xFF] ^ TD3[s1 & 0xFF] ^ k0,
+            TD0[s1 >> 24] ^ TD1[(s0 >> 16) & 0xFF] ^ TD2[(s3 >> 8) & 0xFF] ^ TD3[s2 & 0xFF] ^ k1,
+            TD0[s2 >> 24] ^ TD1[(s1 >> 16) & 0xFF] ^ TD2[(s0 >> 8) & 0xFF] ^ TD3[s3 & 0xFF] ^ k2,
+            TD0[s3 >> 24] ^ TD1[(s2 >> 16) & 0xFF] ^ TD2[(s1 >> 8) & 0xFF] ^ TD3[s0 & 0xFF] ^ k3,
+        )
+
+    # Final round (no InvMixColumns): InvSubBytes + InvShiftRows
+    k0, k1, k2, k3 = round_keys[Nr]
+    return _BLOCK_WORDS.pack(
+        ((INV_S_BOX[s0 >> 24] << 24) | (INV_S_BOX[(s3 >> 16) & 0xFF] << 16) |
+         (INV_S_BOX[(s2 >> 8) & 0xFF] << 8) | INV_S_BOX[s1 & 0xFF]) ^ k0,
+        ((INV_S_BOX[s1 >> 24] << 24) | (INV_S_BOX[(s0 >> 16) & 0xFF] << 16) |
+         (INV_S_BOX[(s3 >> 8) & 0xFF] << 8) | INV_S_BOX[s2 & 0xFF]) ^ k1,
+        ((INV_S_BOX[s2 >> 24] << 24) | (INV_S_BOX[(s1 >> 16) & 0xFF] << 16) |
+         (INV_S_BOX[(s0 >> 8) & 0xFF] << 8) | INV_S_BOX[s3 & 0xFF]) ^ k2,
+        ((INV_S_BOX[s3 >> 24] << 24) | (INV_S_BOX[(s2 >> 16) & 0xFF] << 16) |
+         (INV_S_BOX[(s1 >> 8) & 0xFF] << 8) | INV_S_BOX[s0 & 0xFF]) ^ k3,
+    )
+
+def _compile_block_function(round_keys: tuple[RoundKey, ...], tables: tuple,
+                            sbox: tuple[int, ...], step: int):
+    """
+    Generates and compiles a block function specialised to one key schedule.
+
+    The generated code is the T-table cipher with the round loop unrolled
+    and every round key written in as an integer literal, so a call runs
+    straight-line code with no loop or round-key indexing. Each round
+    reads the state from one set of variables (s0..s3 or t0..t3) and
+    writes the other.
+    step is +1 for encryption (ShiftRows takes row r from column c + r)
+    and -1 for decryption (InvShiftRows takes it from column c - r).
+    """
+    Nr = len(round_keys) - 1
+
+    def col(c: int, r: int) -> int:
+        # Column whose row-r byte lands in column c after (Inv)ShiftRows
+        return (c + r*step) % 4
+
+    lines = ["def crypt_block(block):"]
+
+    # Load the state, with the initial AddRoundKey
+    lines.append("    s0, s1, s2, s3 = unpack(block)")
+    for c in range(4):
+        lines.append(f"    s{c} ^= {round_keys[0][c]:#010x}")
+
+    # Main rounds via the T-tables
+    src, dst = "s", "t"
+    for i in range(1, Nr):
         for c in range(4):
-            state[r][c] = data[c*4 + r]
-    return state
+            lines.append(
+                f"    {dst}{c} = T0[{src}{c} >> 24] ^ T1[({src}{col(c, 1)} >> 16) & 0xFF] ^ "
+                f"T2[({src}{col(c, 2)} >> 8) & 0xFF] ^ T3[{src}{col(c, 3)} & 0xFF] ^ "
+                f"{round_keys[i][c]:#010x}"
+            )
+        src, dst = dst, src
+
+    # Final round (no MixColumns) with the plain S-box
+    lines.append("    return pack(")
+    for c in range(4):
+        lines.append(
+            f"        ((S[{src}{c} >> 24] << 24) | (S[({src}{col(c, 1)} >> 16) & 0xFF] << 16) | "
+            f"(S[({src}{col(c, 2)} >> 8) & 0xFF] << 8) | S[{src}{col(c, 3)} & 0xFF]) ^ "
+            f"{round_keys[Nr][c]:#010x},"
+        )
+    lines.append("    )")
+
+    t0, t1, t2, t3 = tables
+    namespace = {
+        'T0': t0, 'T1': t1, 'T2': t2, 'T3': t3, 'S': sbox,
+        'pack': _BLOCK_WORDS.pack, 'unpack': _BLOCK_WORDS.unpack,
+    }
+    exec(compile("\n".join(lines), "<aes-round-codegen>", "exec"), namespace)
+    return namespace['crypt_block']
+
+# Number of blocks a key has to be used for before encrypt_block/decrypt_block
+# generate a function specialised to it. Generating one costs ~1ms, about as
+# much as the ~1us per block it saves over ~1000 blocks.
+_CODEGEN_THRESHOLD = 1024
+
+class _KeyUsage:
+    """
+    How many blocks a key has been used for in each direction, and the
+    block functions generated for it once it passes _CODEGEN_THRESHOLD.
+    """
+    __slots__ = ('encrypt_calls', 'decrypt_calls', 'encrypt', 'decrypt')
+
+    def __init__(self):
+        self.encrypt_calls = 0
+        self.decrypt_calls = 0
+        self.encrypt = None
+        self.decrypt = None
 
-def _state_to_bytes(state: State) -> bytes:
-    """Converts a 4x4 state back into a 16-byte block (column-major)."""
-    return bytes(state[r][c] for c in range(4) for r in range(4))
+@functools.lru_cache(maxsize=32)
+def _key_usage(key: bytes) -> _KeyUsage:
+    """
+    The usage record for key. It has its own LRU cache, separate from the
+    key schedule caches, so a key evicted from it starts counting again.
+    """
+    return _KeyUsage()
+
+@functools.lru_cache(maxsize=32)
+def _packed_schedules(key: bytes) -> tuple[bytes, bytes]:
+    """
+    The encryption and decryption key schedules for the native core, each
+    packed as big-endian 32-bit words (16 bytes per round key).
+    """
+    enc = b''.join(_BLOCK_WORDS.pack(*rk) for rk in _key_expansion_cached(key))
+    dec = b''.join(_BLOCK_WORDS.pack(*rk) for rk in _inv_key_expansion_cached(key))
+    return enc, dec
 
 def encrypt_block(block: bytes, key: bytes) -> bytes:
-    """Encrypts a single 16-byte block."""
+    """
+    Encrypts a single 16-byte block.
+    Uses the native core when it is built. Otherwise runs the T-table
+    rounds, and once a key has been used for _CODEGEN_THRESHOLD blocks,
+    switches to a cipher function generated for that key.
+    """
     if len(block) != 16:
         raise ValueError("Block must be 16 bytes")
-        
-    round_keys = _key_expansion(key)
-    Nr = len(round_keys) - 1 # Number of rounds
+    key = bytes(key)
+    if _encrypt_block_native is not None:
+        return _encrypt_block_native(block, _packed_schedules(key)[0])
+
+    usage = _key_usage(key)
+    if usage.encrypt is not None:
+        return usage.encrypt(block)
+    usage.encrypt_calls += 1
+    if usage.encrypt_calls >= _CODEGEN_THRESHOLD:
+        usage.encrypt = _compile_block_function(
+            _key_expansion_cached(key), (TE0, TE1, TE2, TE3), S_BOX, 1)
+    return _encrypt_rounds(block, _key_expansion_cached(key))
+
+def decrypt_block(block: bytes, key: bytes) -> bytes:
+    """
+    Decrypts a single 16-byte block.
+    Uses the native core when it is built. Otherwise runs the T-table
+    rounds, and once a key has been used for _CODEGEN_THRESHOLD blocks,
+    switches to a decipher function generated for that key.
+    """
+    if len(block) != 16:
+        raise ValueError("Block must be 16 bytes")
+    key = bytes(key)
+    if _decrypt_block_native is not None:
+        return _decrypt_block_native(block, _packed_schedules(key)[1])
 
-    state = _bytes_to_state(block)
+    usage = _key_usage(key)
+    if usage.decrypt is not None:
+        return usage.decrypt(block)
+    usage.decrypt_calls += 1
+    if usage.decrypt_calls >= _CODEGEN_THRESHOLD:
+        usage.decrypt = _compile_block_function(
+            _inv_key_expansion_cached(key), (TD0, TD1, TD2, TD3), INV_S_BOX, -1)
+    return _decrypt_rounds(block, _inv_key_expansion_cached(key))
+
+def _crypt_blocks_numpy(data: bytes, round_keys: tuple[RoundKey, ...],
+                        tables: tuple, sbox, step: int) -> bytes:
+    """
+    Runs the T-table rounds over every 16-byte block of data at once.
+    Each column of the state is a numpy array holding that column word for
+    all blocks, so one table lookup covers every block.
+    step is +1 for encryption (ShiftRows takes row r from column c + r)
+    and -1 for decryption (InvShiftRows takes it from column c - r).
+    """
+    t0, t1, t2, t3 = tables
+    words = np.frombuffer(data, dtype='>u4').reshape(-1, 4)
 
     # Initial AddRoundKey
-    _add_round_key(state, round_keys[0])
+    s = [words[:, c].astype(np.uint32) ^ round_keys[0][c] for c in range(4)]
 
     # Main rounds
-    for i in range(1, Nr):
-        _sub_bytes(state)
-        _shift_rows(state)
-        _mix_columns(state)
-        _add_round_key(state, round_keys[i])
+    for rk in round_keys[1:-1]:
+        s = [t0[s[c] >> 24] ^
+             t1[(s[(c + step) % 4] >> 16) & 0xFF] ^
+             t2[(s[(c + 2*step) % 4] >> 8) & 0xFF] ^
+             t3[s[(c + 3*step) % 4] & 0xFF] ^ rk[c]
+             for c in range(4)]
 
-    # Final round (no MixColumns)
-    _sub_bytes(state)
-    _shift_rows(state)
-    _add_round_key(state, round_keys[Nr])
+    # Final round (no MixColumns) with the plain S-box
+    rk = round_keys[-1]
+    out = np.empty(words.shape, dtype='>u4')
+    for c in range(4):
+        out[:, c] = ((sbox[s[c] >> 24] << 24) |
+                     (sbox[(s[(c + step) % 4] >> 16) & 0xFF] << 16) |
+                     (sbox[(s[(c + 2*step) % 4] >> 8) & 0xFF] << 8) |
+                     sbox[s[(c + 3*step) % 4] & 0xFF]) ^ rk[c]
+    return out.tobytes()
 
-    return _state_to_bytes(state)
+# Below this many blocks, the fixed cost of setting up the numpy arrays
+# outweighs batching and encrypt_blocks/decrypt_blocks loop per block instead
+_NUMPY_MIN_BLOCKS = 40
 
-def decrypt_block(block: bytes, key: bytes) -> bytes:
-    """Decrypts a single 16-byte block."""
-    if len(block) != 16:
-        raise ValueError("Block must be 16 bytes")
-        
-    round_keys = _key_expansion(key)
-    Nr = len(round_keys) - 1
+def encrypt_blocks(blocks: bytes, key: bytes) -> bytes:
+    """
+    Encrypts data made of whole 16-byte blocks, each block independently
+    (ECB mode). Runs each block through the native core when it is built.
+    Otherwise uses numpy to process all blocks together when it is
+    installed and there are enough blocks, and calls encrypt_block once
+    per block when not.
+    """
+    if len(blocks) % 16 != 0:
+        raise ValueError("Data length must be a multiple of 16 bytes")
 
-    state = _bytes_to_state(block)
+    if _encrypt_block_native is not None:
+        schedule = _packed_schedules(bytes(key))[0]
+        data = memoryview(blocks)
+        return b''.join(_encrypt_block_native(data[i : i+16], schedule) for i in range(0, len(data), 16))
 
-    # Initial AddRoundKey (with last round key)
-    _add_round_key(state, round_keys[Nr])
+    if np is None or len(blocks) < _NUMPY_MIN_BLOCKS * 16:
+        return b''.join(encrypt_block(blocks[i : i+16], key) for i in range(0, len(blocks), 16))
 
-    # Main rounds (in reverse)
-    for i in range(Nr - 1, 0, -1):
-        _inv_shift_rows(state)
-        _inv_sub_bytes(state)
-        _add_round_key(state, round_keys[i])
-        _inv_mix_columns(state)
+    round_keys = _key_expansion_cached(bytes(key))
+    return _crypt_blocks_numpy(blocks, round_keys, _TE_NP, _S_BOX_NP, 1)
+
+def decrypt_blocks(blocks: bytes, key: bytes) -> bytes:
+    """
+    Decrypts data made of whole 16-byte blocks, each block independently
+    (ECB mode). Runs each block through the native core when it is built.
+    Otherwise uses numpy to process all blocks together when it is
+    installed and there are enough blocks, and calls decrypt_block once
+    per block when not.
+    """
+    if len(blocks) % 16 != 0:
+        raise ValueError("Data length must be a multiple of 16 bytes")
+
+    if _decrypt_block_native is not None:
+        schedule = _packed_schedules(bytes(key))[1]
+        data = memoryview(blocks)
+        return b''.join(_decrypt_block_native(data[i : i+16], schedule) for i in range(0, len(data), 16))
 
-    # Final round (no InvMixColumns)
-    _inv_shift_rows(state)
-    _inv_sub_bytes(state)
-    _add_round_key(state, round_keys[0])
+    if np is None or len(blocks) < _NUMPY_MIN_BLOCKS * 16:
+        return b''.join(decrypt_block(blocks[i : i+16], key) for i in range(0, len(blocks), 16))
 
-    return _state_to_bytes(state)
+    round_keys = _inv_key_expansion_cached(bytes(key))
+    return _crypt_blocks_numpy(blocks, round_keys, _TD_NP, _INV_S_BOX_NP, -1)
+
+@functools.lru_cache(maxsize=32)
+def _openssl_contexts(key: bytes):
+    """
+    Returns an (encryptor, decryptor) pair of OpenSSL ECB contexts for key.
+    ECB contexts carry no state between blocks, so they are created once
+    per key and reused across calls.
+    """
+    cipher = Cipher(algorithms.AES(key), modes.ECB())
+    return cipher.encryptor(), cipher.decryptor()
+
+def encrypt_block_fast(block: bytes, key: bytes) -> bytes:
+    """
+    Encrypts a single 16-byte block using OpenSSL via the 'cryptography'
+    package. Falls back to encrypt_block when it is not installed.
+    """
+    if Cipher is None:
+        return encrypt_block(block, key)
+    if len(block) != 16:
+        raise ValueError("Block must be 16 bytes")
+    return _openssl_contexts(bytes(key))[0].update(block)
+
+def decrypt_block_fast(block: bytes, key: bytes) -> bytes:
+    """
+    Decrypts a single 16-byte block using OpenSSL via the 'cryptography'
+    package. Falls back to decrypt_block when it is not installed.
+    """
+    if Cipher is None:
+        return decrypt_block(block, key)
+    if len(block) != 16:
+        raise ValueError("Block must be 16 bytes")
+    return _openssl_contexts(bytes(key))[1].update(block)
@@ -79,3 +79,41 @@ def gmul(a: int, b: int) -> int:
         b >>= 1           # Right shift b
         
     return p & 0xFF
+
+# Pre-computed GF(2^8) multiplication tables for the MixColumns constants.
+# MULn[x] == gmul(x, n), so the hot path does a table lookup instead of
+# running the bit-serial multiplication above.
+MUL2 = bytes(gmul(x, 2) for x in range(256))
+MUL3 = bytes(gmul(x, 3) for x in range(256))
+MUL9 = bytes(gmul(x, 9) for x in range(256))
+MUL11 = bytes(gmul(x, 11) for x in range(256))
+MUL13 = bytes(gmul(x, 13) for x in range(256))
+MUL14 = bytes(gmul(x, 14) for x in range(256))
+
+def _rotate_table(table: tuple[int, ...], n: int) -> tuple[int, ...]:
+    """Rotates every 32-bit entry of a table right by n bits."""
+    return tuple(((t >> n) | (t << (32 - n))) & 0xFFFFFFFF for t in table)
+
+# T-tables for encryption. A full round (SubBytes, ShiftRows, MixColumns)
+# computes each output column as the XOR of four table lookups, one per
+# input byte. TE0[x] is the column contributed by byte x in row 0: the
+# MixColumns matrix column (2, 1, 1, 3) times S_BOX[x], packed big-endian.
+# TE1..TE3 are the same values rotated for rows 1..3.
+TE0 = tuple((MUL2[s] << 24) | (s << 16) | (s << 8) | MUL3[s] for s in S_BOX)
+TE1 = _rotate_table(TE0, 8)
+TE2 = _rotate_table(TE0, 16)
+TE3 = _rotate_table(TE0, 24)
+
+# T-tables for decryption: the inverse MixColumns matrix column
+# (0x0E, 0x09, 0x0D, 0x0B) times INV_S_BOX[x].
+TD0 = tuple((MUL14[s] << 24) | (MUL9[s] << 16) | (MUL13[s] << 8) | MUL11[s] for s in INV_S_BOX)
+TD1 = _rotate_table(TD0, 8)
+TD2 = _rotate_table(TD0, 16)
+TD3 = _rotate_table(TD0, 24)
+
+# SubWord tables for the key expansion: SUBn[x] is S_BOX[x] shifted into
+# byte position n of a 32-bit word, so SubWord is four lookups ORed together.
+SUB0 = S_BOX
+SUB1 = tuple(s << 8 for s in S_BOX)
+SUB2 = tuple(s << 16 for s in S_BOX)
+SUB3 = tuple(s << 24 for s in S_BOX)
@@ -1,31 +1,58 @@
 # This file contains core mathematical functions, primarily for number theory
 # used in the RSA algorithm.
 
-import random
+import math
+import secrets
+from typing import Optional
+
+def _small_primes(limit: int) -> list[int]:
+    """Returns all odd primes below limit (sieve of Eratosthenes)."""
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b'\x00\x00'
+    for i in range(2, math.isqrt(limit - 1) + 1):
+        if sieve[i]:
+            sieve[i*i::i] = bytes(len(range(i*i, limit, i)))
+    return [i for i in range(3, limit) if sieve[i]]
+
+# Product of the odd primes below SMALL_PRIMES_LIMIT. A single gcd against it
+# rejects most prime candidates before any Miller-Rabin rounds are run.
+SMALL_PRIMES_LIMIT = 2000
+SMALL_PRIMES_PROD = math.prod(_small_primes(SMALL_PRIMES_LIMIT))
 
 def pow_mod(a: int, b: int, m: int) -> int:
     """
-    Computes (a^b) % m efficiently using the method of repeated squares.
-    This is equivalent to Python's built-in pow(a, b, m).
+    Computes (a^b) % m.
+
+    The textbook method is repeated squaring: walk the bits of b, squaring
+    a at each step and multiplying it into the result when the bit is set.
+    Python's built-in pow(a, b, m) implements the same idea (with a
+    sliding window) in C, so this simply delegates to it.
     """
-    res = 1
-    a %= m
-    while b > 0:
-        if b % 2 == 1:
-            res = (res * a) % m
-        a = (a * a) % m
-        b //= 2
-    return res
-
-def _is_prime_miller_rabin(n: int, k: int = 40) -> bool:
+    return pow(a, b, m)
+
+# Fixed Miller-Rabin bases: the first 12 primes. Testing all of them is a
+# deterministic primality proof for n < DETERMINISTIC_LIMIT (about 2^78).
+WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+DETERMINISTIC_LIMIT = 318665857834031151167461
+
+def _is_prime_miller_rabin(n: int, k: Optional[int] = None) -> bool:
     """
-    Probabilistic Miller-Rabin primality test.
+    Miller-Rabin primality test.
     Returns True if n is *probably* prime, False if it is composite.
-    k is the number of rounds of testing to perform.
+
+    Below DETERMINISTIC_LIMIT every base in WITNESSES is tried and the
+    answer is exact. Above it, k rounds are performed (by default 6 for
+    n of 512 bits or more, 20 otherwise), using the fixed WITNESSES
+    first and random bases for any rounds beyond them. Fixed bases are
+    meant for random candidates, as produced by generate_prime; a
+    composite built to fool them is not something RSA key generation
+    will ever draw.
     """
-    if n == 2 or n == 3:
+    if n < 2:
+        return False
+    if n in WITNESSES:
         return True
-    if n < 5 or n % 2 == 0:
+    if any(n % p == 0 for p in WITNESSES):
         return False
 
     # Write n-1 as 2^r * d
@@ -35,16 +62,24 @@ def _is_prime_miller_rabin(n: int, k: int = 40) -> bool:
         d //= 2
         r += 1
 
-    # Perform k rounds of testing
-    for _ in range(k):
-        a = random.randrange(2, n - 2)
-        x = pow_mod(a, d, n)
+    # Choose the bases to test
+    if n < DETERMINISTIC_LIMIT:
+        bases = list(WITNESSES)
+    else:
+        if k is None:
+            k = 6 if n.bit_length() >= 512 else 20
+        bases = list(WITNESSES[:k])
+        bases += [secrets.randbelow(n - 4) + 2 for _ in range(k - len(bases))]  # 2 <= a <= n - 3
+
+    # Perform one round of testing per base
+    for a in bases:
+        x = pow(a, d, n)
 
         if x == 1 or x == n - 1:
             continue
 
         for _ in range(r - 1):
-            x = pow_mod(x, 2, n)
+            x = pow(x, 2, n)
             if x == n - 1:
                 break
         else:
@@ -59,25 +94,34 @@ def generate_prime(bits: int) -> int:
     Generates a prime number of specified bit length.
     """
     while True:
-        # Generate a random number of the correct bit length
-        # Ensure it's odd and has the high bit set
-        p = random.randrange(1 << (bits - 1), 1 << bits)
-        if p % 2 == 0:
-            p += 1
-            
+        # Generate a random number of the correct bit length from the OS
+        # CSPRNG, forcing the high bit (exact size) and low bit (odd) on
+        p = secrets.randbits(bits) | (1 << (bits - 1)) | 1
+
+        # Cheap trial division by all small primes at once
+        if p > SMALL_PRIMES_LIMIT and math.gcd(p, SMALL_PRIMES_PROD) != 1:
+            continue
+
+        # Candidates are random, so at the bit sizes used by RSA the chance
+        # of a composite passing the default number of rounds is negligible
         if _is_prime_miller_rabin(p):
             return p
 
 def egcd(a: int, b: int) -> tuple[int, int, int]:
     """
-    Extended Euclidean Algorithm.
+    Extended Euclidean Algorithm (iterative form).
     Returns (g, x, y) such that a*x + b*y = g = gcd(a, b)
     """
-    if a == 0:
-        return (b, 0, 1)
-    else:
-        g, y, x = egcd(b % a, a)
-        return (g, x - (b // a) * y, y)
+    # Invariants: old_r == a*old_x + b*old_y and r == a*x + b*y
+    old_r, r = a, b
+    old_x, x = 1, 0
+    old_y, y = 0, 1
+    while r != 0:
+        q, rem = divmod(old_r, r)
+        old_r, r = r, rem
+        old_x, x = x, old_x - q * x
+        old_y, y = y, old_y - q * y
+    return (old_r, old_x, old_y)
 
 def mod_inverse(a: int, m: int) -> int:
     """
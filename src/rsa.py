@@ -4,14 +4,29 @@ import src.math_utils as math_utils
 import math
 
 class RsaKeyPair:
-    """A simple container for a public/private key pair."""
-    def __init__(self, e, d, n):
+    """
+    A simple container for a public/private key pair.
+    When the primes p and q are given, also keeps the CRT exponents derived
+    from them, which decrypt_crt uses to speed up decryption.
+    """
+    def __init__(self, e, d, n, p=None, q=None):
         self.e = e  # Public exponent
         self.d = d  # Private exponent
         self.n = n  # Modulus
+        self.p = p  # First prime factor of n
+        self.q = q  # Second prime factor of n
         self.public_key = (e, n)
         self.private_key = (d, n)
 
+        if p is not None and q is not None:
+            self.dp = d % (p - 1)                   # d mod (p-1)
+            self.dq = d % (q - 1)                   # d mod (q-1)
+            self.qinv = math_utils.mod_inverse(q, p)  # q^-1 mod p
+            self.crt_private_key = (p, q, self.dp, self.dq, self.qinv)
+        else:
+            self.dp = self.dq = self.qinv = None
+            self.crt_private_key = None
+
 def generate_keypair(bits: int = 1024) -> RsaKeyPair:
     """
     Generates an RSA key pair.
@@ -45,7 +60,7 @@ def generate_keypair(bits: int = 1024) -> RsaKeyPair:
     # Calculate private exponent d
     d = math_utils.mod_inverse(e, phi_n)
     
-    return RsaKeyPair(e, d, n)
+    return RsaKeyPair(e, d, n, p, q)
 
 def _bytes_to_int(data: bytes) -> int:
     """Converts a byte string to an integer (big-endian)."""
@@ -74,7 +89,7 @@ def encrypt(public_key: tuple[int, int], message: bytes) -> bytes:
         raise ValueError(f"Message size ({len(message)} bytes) is too large for this key.")
 
     # Perform modular exponentiation
-    c_int = math_utils.pow_mod(m_int, e, n)
+    c_int = pow(m_int, e, n)
     
     # Convert back to bytes, padded to the size of the modulus
     return _int_to_bytes(c_int, n_bytes)
@@ -94,7 +109,7 @@ def decrypt(private_key: tuple[int, int], ciphertext: bytes) -> bytes:
     c_int = _bytes_to_int(ciphertext)
     
     # Perform modular exponentiation
-    m_int = math_utils.pow_mod(c_int, d, n)
+    m_int = pow(c_int, d, n)
     
     # Convert back to bytes. The padding here is tricky.
     # We must strip leading null bytes that were added during encryption.
@@ -106,3 +121,35 @@ def decrypt(private_key: tuple[int, int], ciphertext: bytes) -> bytes:
         # Fallback if m_int is larger than n_bytes can hold
         # (shouldn't happen in standard decryption)
         return m_int.to_bytes(n_bytes + 1, 'big').lstrip(b'\x00')
+
+def decrypt_crt(crt_private_key: tuple[int, int, int, int, int], ciphertext: bytes) -> bytes:
+    """
+    Decrypts a byte message using the CRT form of the private key
+    (p, q, dp, dq, qinv), as stored in RsaKeyPair.crt_private_key.
+    
+    Instead of one exponentiation modulo n, this does two with half-size
+    moduli and exponents, then recombines them (Garner's formula):
+    m1 = c^dp mod p
+    m2 = c^dq mod q
+    h = qinv * (m1 - m2) mod p
+    Message = m2 + h * q
+    """
+    p, q, dp, dq, qinv = crt_private_key
+    n = p * q
+    
+    # Calculate byte size of modulus
+    n_bytes = math.ceil(n.bit_length() / 8)
+
+    # Convert ciphertext to integer
+    c_int = _bytes_to_int(ciphertext)
+
+    # Two half-size modular exponentiations
+    m1 = pow(c_int, dp, p)
+    m2 = pow(c_int, dq, q)
+
+    # Recombine into the message modulo n
+    h = (qinv * (m1 - m2)) % p
+    m_int = m2 + h * q
+
+    # m_int < n, so it always fits; strip the leading null bytes as in decrypt
+    return _int_to_bytes(m_int, n_bytes).lstrip(b'\x00')
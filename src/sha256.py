@@ -2,6 +2,15 @@
 # It follows the FIPS 180-4 specification.
 
 import struct
+from operator import add
+
+# Optional native compression function (SHA-NI with a scalar C fallback).
+# See src/_sha256_ni.c for build instructions; without it, the pure-Python
+# _process_chunk below is used.
+try:
+    from src._sha256_ni import process_chunks as _process_chunks_native
+except ImportError:
+    _process_chunks_native = None
 
 # SHA-256 Constants
 # ---
@@ -27,63 +36,53 @@ H_INIT = [
     0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
 ]
 
-# Bitwise logical functions
+# Bitwise logical functions (FIPS 180-4, section 4.1.2)
 # ---
-def _rotr(x: int, n: int, bits: int = 32) -> int:
-    """Circular right rotation (rotate right)."""
-    mask = (1 << bits) - 1
-    return ((x >> n) | (x << (bits - n))) & mask
-
-def _ch(x: int, y: int, z: int) -> int:
-    """Choose: (x AND y) XOR (NOT x AND z)"""
-    return (x & y) ^ (~x & z)
-
-def _maj(x: int, y: int, z: int) -> int:
-    """Majority: (x AND y) XOR (x AND z) XOR (y AND z)"""
-    return (x & y) ^ (x & z) ^ (y & z)
-
-def _sigma0(x: int) -> int:
-    """ROTR 2(x) XOR ROTR 13(x) XOR ROTR 22(x)"""
-    return _rotr(x, 2) ^ _rotr(x, 13) ^ _rotr(x, 22)
-
-def _sigma1(x: int) -> int:
-    """ROTR 6(x) XOR ROTR 11(x) XOR ROTR 25(x)"""
-    return _rotr(x, 6) ^ _rotr(x, 11) ^ _rotr(x, 25)
-
-def _gamma0(x: int) -> int:
-    """ROTR 7(x) XOR ROTR 18(x) XOR SHR 3(x)"""
-    return _rotr(x, 7) ^ _rotr(x, 18) ^ (x >> 3)
-
-def _gamma1(x: int) -> int:
-    """ROTR 17(x) XOR ROTR 19(x) XOR SHR 10(x)"""
-    return _rotr(x, 17) ^ _rotr(x, 19) ^ (x >> 10)
-
-def _add(a: int, b: int, bits: int = 32) -> int:
-    """Addition modulo 2^32."""
-    return (a + b) & ((1 << bits) - 1)
-
-def _padding(message: bytes) -> bytes:
+# These are written inline in _process_chunk, since a Python function call
+# per operation would cost more than the operation itself:
+#   ROTR n(x) = (x >> n) | (x << (32 - n))
+#   Ch(x, y, z)  = (x AND y) XOR (NOT x AND z)
+#                = z XOR (x AND (y XOR z))         (one AND fewer, no NOT)
+#   Maj(x, y, z) = (x AND y) XOR (x AND z) XOR (y AND z)
+#                = (x AND y) OR (z AND (x OR y))
+#   Σ0(x) = ROTR 2(x)  XOR ROTR 13(x) XOR ROTR 22(x)
+#   Σ1(x) = ROTR 6(x)  XOR ROTR 11(x) XOR ROTR 25(x)
+#   σ0(x) = ROTR 7(x)  XOR ROTR 18(x) XOR SHR 3(x)
+#   σ1(x) = ROTR 17(x) XOR ROTR 19(x) XOR SHR 10(x)
+# Rotations leave stray bits above bit 31. They never reach the low 32 bits,
+# so results are masked only once, when a new word or state value is stored.
+MASK = 0xFFFFFFFF
+
+def _padding_tail(tail: bytes, message_len: int) -> bytes:
     """
-    Applies the Merkle-Damgård padding to the message.
+    Pads the last, partial chunk of a message (fewer than 64 bytes) whose
+    total length is message_len bytes. Returns one or two 64-byte chunks.
     1. Append a single '1' bit (0x80 byte).
     2. Append '0' bits until message length % 512 == 448 bits (56 bytes).
     3. Append the original message length as a 64-bit big-endian integer.
     """
-    original_len_bits = len(message) * 8
-    
     # 1. Append 0x80
-    padded = message + b'\x80'
+    padded = bytearray(tail)
+    padded.append(0x80)
     
     # 2. Append 0x00...
     # Calculate bytes needed to reach 56 bytes (mod 64)
     # (64 bytes per chunk)
     bytes_to_add = (56 - (len(padded) % 64)) % 64
-    padded += b'\x00' * bytes_to_add
+    padded += bytes(bytes_to_add)
     
     # 3. Append 64-bit length
-    padded += struct.pack('>Q', original_len_bits)
+    padded += struct.pack('>Q', message_len * 8)
     
-    return padded
+    return bytes(padded)
+
+def _padding(message: bytes) -> bytes:
+    """
+    Applies the Merkle-Damgård padding to the whole message.
+    Only the final partial chunk changes, see _padding_tail.
+    """
+    full_len = len(message) - len(message) % 64
+    return message[:full_len] + _padding_tail(message[full_len:], len(message))
 
 def _process_chunk(chunk: bytes, h: list[int]) -> list[int]:
     """
@@ -93,50 +92,51 @@ def _process_chunk(chunk: bytes, h: list[int]) -> list[int]:
         raise ValueError("Chunk must be 64 bytes")
         
     # 1. Prepare the message schedule (w)
-    w = [0] * 64
-    
     # First 16 words are from the chunk (big-endian 32-bit words)
-    for i in range(16):
-        w[i] = struct.unpack('>I', chunk[i*4 : i*4 + 4])[0]
+    w = list(struct.unpack('>16I', chunk))
         
-    # Extend to 64 words
+    # Extend to 64 words: w[i] = σ1(w[i-2]) + w[i-7] + σ0(w[i-15]) + w[i-16]
     for i in range(16, 64):
-        s0 = _gamma0(w[i-15])
-        s1 = _gamma1(w[i-2])
-        w[i] = _add(_add(_add(w[i-16], s0), w[i-7]), s1)
+        x = w[i-15]
+        s0 = ((x >> 7) | (x << 25)) ^ ((x >> 18) | (x << 14)) ^ (x >> 3)
+        x = w[i-2]
+        s1 = ((x >> 17) | (x << 15)) ^ ((x >> 19) | (x << 13)) ^ (x >> 10)
+        w.append((w[i-16] + s0 + w[i-7] + s1) & MASK)
 
     # 2. Initialize working variables
     a, b, c, d, e, f, g, h0 = h
 
     # 3. Compression loop
-    for i in range(64):
-        S1 = _sigma1(e)
-        ch = _ch(e, f, g)
-        temp1 = _add(_add(_add(_add(h0, S1), ch), K[i]), w[i])
+    # K[i] + w[i] does not depend on the working variables, so all 64 sums
+    # are formed up front in one pass (masking happens later, as above)
+    for kw in map(add, K, w):
+        S1 = ((e >> 6) | (e << 26)) ^ ((e >> 11) | (e << 21)) ^ ((e >> 25) | (e << 7))
+        ch = g ^ (e & (f ^ g))
+        temp1 = h0 + S1 + ch + kw
         
-        S0 = _sigma0(a)
-        maj = _maj(a, b, c)
-        temp2 = _add(S0, maj)
+        S0 = ((a >> 2) | (a << 30)) ^ ((a >> 13) | (a << 19)) ^ ((a >> 22) | (a << 10))
+        maj = (a & b) | (c & (a | b))
+        temp2 = S0 + maj
 
         h0 = g
         g = f
         f = e
-        e = _add(d, temp1)
+        e = (d + temp1) & MASK
         d = c
         c = b
         b = a
-        a = _add(temp1, temp2)
+        a = (temp1 + temp2) & MASK
 
     # 4. Compute the new intermediate hash value
     return [
-        _add(h[0], a),
-        _add(h[1], b),
-        _add(h[2], c),
-        _add(h[3], d),
-        _add(h[4], e),
-        _add(h[5], f),
-        _add(h[6], g),
-        _add(h[7], h0)
+        (h[0] + a) & MASK,
+        (h[1] + b) & MASK,
+        (h[2] + c) & MASK,
+        (h[3] + d) & MASK,
+        (h[4] + e) & MASK,
+        (h[5] + f) & MASK,
+        (h[6] + g) & MASK,
+        (h[7] + h0) & MASK
     ]
 
 def hash(message: str) -> str:
@@ -147,16 +147,27 @@ def hash(message: str) -> str:
     # 1. Encode string to bytes (UTF-8)
     message_bytes = message.encode('utf-8')
     
-    # 2. Apply padding
-    padded_message = _padding(message_bytes)
+    # 2. Split the message into its full 64-byte chunks, which are hashed
+    # in place, and the padded final chunk(s). The message is never copied.
+    full_len = len(message_bytes) - len(message_bytes) % 64
+    body = memoryview(message_bytes)[:full_len]
+    tail = _padding_tail(message_bytes[full_len:], len(message_bytes))
     
     # 3. Initialize hash state
     h = list(H_INIT)
     
     # 4. Process the message in 64-byte chunks
-    for i in range(0, len(padded_message), 64):
-        chunk = padded_message[i : i+64]
-        h = _process_chunk(chunk, h)
+    if _process_chunks_native is not None:
+        # The native module runs each buffer in a single call
+        state = struct.pack('>8I', *h)
+        state = _process_chunks_native(state, body)
+        state = _process_chunks_native(state, tail)
+        h = list(struct.unpack('>8I', state))
+    else:
+        for i in range(0, full_len, 64):
+            h = _process_chunk(body[i : i+64], h)
+        for i in range(0, len(tail), 64):
+            h = _process_chunk(tail[i : i+64], h)
         
     # 5. Concatenate final hash values
     final_hash = ""
@@ -0,0 +1,103 @@
+# This file implements a Numba-compiled variant of the SHA-256 hash function.
+# It uses the same constants and padding as src/sha256.py, but runs the
+# compression loop as native code on uint32 arrays.
+#
+# Requires the optional 'numba' and 'numpy' packages. The first call compiles
+# the functions below (cached on disk afterwards).
+
+import numpy as np
+from numba import njit, types, uint8, uint32
+
+from src.sha256 import K, H_INIT, _padding
+
+K_NP = np.array(K, dtype=np.uint32)
+
+# Message bytes are passed as a read-only view of the padded bytes object
+_bytes_t = types.Array(uint8, 1, 'C', readonly=True)
+
+@njit(uint32(uint32, uint32), inline='always')
+def _rotr(x, n):
+    """Circular right rotation (rotate right) of a 32-bit word."""
+    return np.uint32((x >> n) | (x << (np.uint32(32) - n)))
+
+@njit(uint32[:](uint32[:], _bytes_t), cache=True, boundscheck=False)
+def _compress(h, chunk):
+    """
+    Processes a 512-bit (64-byte) chunk and returns the updated hash state.
+    All arithmetic stays in uint32, so additions wrap modulo 2^32 natively.
+    """
+    # 1. Prepare the message schedule (w)
+    w = np.empty(64, np.uint32)
+    for i in range(16):
+        w[i] = ((np.uint32(chunk[i*4]) << np.uint32(24)) |
+                (np.uint32(chunk[i*4 + 1]) << np.uint32(16)) |
+                (np.uint32(chunk[i*4 + 2]) << np.uint32(8)) |
+                np.uint32(chunk[i*4 + 3]))
+
+    for i in range(16, 64):
+        x = w[i-15]
+        s0 = _rotr(x, np.uint32(7)) ^ _rotr(x, np.uint32(18)) ^ (x >> np.uint32(3))
+        x = w[i-2]
+        s1 = _rotr(x, np.uint32(17)) ^ _rotr(x, np.uint32(19)) ^ (x >> np.uint32(10))
+        w[i] = np.uint32(w[i-16] + s0 + w[i-7] + s1)
+
+    # 2. Initialize working variables
+    a = h[0]
+    b = h[1]
+    c = h[2]
+    d = h[3]
+    e = h[4]
+    f = h[5]
+    g = h[6]
+    h0 = h[7]
+
+    # 3. Compression loop
+    for i in range(64):
+        S1 = _rotr(e, np.uint32(6)) ^ _rotr(e, np.uint32(11)) ^ _rotr(e, np.uint32(25))
+        ch = g ^ (e & (f ^ g))
+        temp1 = np.uint32(h0 + S1 + ch + K_NP[i] + w[i])
+
+        S0 = _rotr(a, np.uint32(2)) ^ _rotr(a, np.uint32(13)) ^ _rotr(a, np.uint32(22))
+        maj = (a & b) | (c & (a | b))
+        temp2 = np.uint32(S0 + maj)
+
+        h0 = g
+        g = f
+        f = e
+        e = np.uint32(d + temp1)
+        d = c
+        c = b
+        b = a
+        a = np.uint32(temp1 + temp2)
+
+    # 4. Compute the new intermediate hash value
+    out = np.empty(8, np.uint32)
+    out[0] = h[0] + a
+    out[1] = h[1] + b
+    out[2] = h[2] + c
+    out[3] = h[3] + d
+    out[4] = h[4] + e
+    out[5] = h[5] + f
+    out[6] = h[6] + g
+    out[7] = h[7] + h0
+    return out
+
+@njit(uint32[:](uint32[:], _bytes_t), cache=True, boundscheck=False)
+def _compress_all(h, data):
+    """Runs the compression function over every 64-byte chunk of data."""
+    for i in range(0, len(data), 64):
+        h = _compress(h, data[i : i+64])
+    return h
+
+def hash(message: str) -> str:
+    """
+    Computes the SHA-256 hash of a given string.
+    Returns the hash as a 64-character hex string.
+    """
+    padded_message = _padding(message.encode('utf-8'))
+    data = np.frombuffer(padded_message, dtype=np.uint8)
+
+    # A single call into compiled code processes every chunk
+    h = _compress_all(np.array(H_INIT, dtype=np.uint32), data)
+
+    return "".join(f"{int(val):08x}" for val in h)
@@ -0,0 +1,119 @@
+# Tests for the AES block cipher.
+# The known-answer vectors are the example encryptions from FIPS-197, Appendix C.
+#
+# Run from the repository root with:
+#     python -m unittest discover tests
+
+import unittest
+from unittest import mock
+
+import src.aes as aes
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+PLAINTEXT = bytes.fromhex('00112233445566778899aabbccddeeff')
+
+# (key, expected ciphertext) for AES-128, AES-192 and AES-256
+VECTORS = [
+    ('000102030405060708090a0b0c0d0e0f',
+     '69c4e0d86a7b0430d8cdb78070b4c55a'),
+    ('000102030405060708090a0b0c0d0e0f1011121314151617',
+     'dda97ca4864cdfe06eaf70a0ec0d7191'),
+    ('000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f',
+     '8ea2b7ca516745bfeafc49904b496089'),
+]
+
+class TestAesKnownAnswer(unittest.TestCase):
+    def test_encrypt_block(self):
+        for key, ciphertext in VECTORS:
+            with self.subTest(key_bits=len(key) * 4):
+                self.assertEqual(
+                    aes.encrypt_block(PLAINTEXT, bytes.fromhex(key)).hex(),
+                    ciphertext,
+                )
+
+    def test_decrypt_block(self):
+        for key, ciphertext in VECTORS:
+            with self.subTest(key_bits=len(key) * 4):
+                self.assertEqual(
+                    aes.decrypt_block(bytes.fromhex(ciphertext), bytes.fromhex(key)),
+                    PLAINTEXT,
+                )
+
+class TestAesGeneratedFunctions(unittest.TestCase):
+    """
+    The known-answer tests again, with the native core disabled and the
+    codegen threshold lowered so the generated block functions take over.
+    """
+    def setUp(self):
+        for name, value in [('_encrypt_block_native', None),
+                            ('_decrypt_block_native', None),
+                            ('_CODEGEN_THRESHOLD', 1)]:
+            patcher = mock.patch.object(aes, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        aes._key_usage.cache_clear()
+        self.addCleanup(aes._key_usage.cache_clear)
+
+    def test_encrypt_block(self):
+        for key, ciphertext in VECTORS:
+            key = bytes.fromhex(key)
+            with self.subTest(key_bits=len(key) * 8):
+                for _ in range(2):
+                    self.assertEqual(aes.encrypt_block(PLAINTEXT, key).hex(), ciphertext)
+                self.assertIsNotNone(aes._key_usage(key).encrypt)
+
+    def test_decrypt_block(self):
+        for key, ciphertext in VECTORS:
+            key = bytes.fromhex(key)
+            with self.subTest(key_bits=len(key) * 8):
+                for _ in range(2):
+                    self.assertEqual(aes.decrypt_block(bytes.fromhex(ciphertext), key), PLAINTEXT)
+                self.assertIsNotNone(aes._key_usage(key).decrypt)
+
+# Block counts around _NUMPY_MIN_BLOCKS, plus the empty and single-block cases
+BLOCK_COUNTS = [0, 1, 39, 40, 200]
+
+class TestAesBlocks(unittest.TestCase):
+    """encrypt_blocks/decrypt_blocks against a loop over the single-block functions."""
+    def check_blocks(self):
+        for key, _ in VECTORS:
+            key = bytes.fromhex(key)
+            for count in BLOCK_COUNTS:
+                data = bytes((i * 7 + count) & 0xFF for i in range(count * 16))
+                with self.subTest(key_bits=len(key) * 8, blocks=count):
+                    expected = b''.join(aes.encrypt_block(data[i : i+16], key)
+                                        for i in range(0, len(data), 16))
+                    self.assertEqual(aes.encrypt_blocks(data, key), expected)
+                    self.assertEqual(aes.decrypt_blocks(expected, key), data)
+
+    def disable(self, *names):
+        for name in names:
+            patcher = mock.patch.object(aes, name, None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_default(self):
+        self.check_blocks()
+
+    def test_python(self):
+        self.disable('_encrypt_block_native', '_decrypt_block_native', 'np')
+        self.check_blocks()
+
+    @unittest.skipUnless(numpy, "numpy is not installed")
+    def test_numpy(self):
+        self.disable('_encrypt_block_native', '_decrypt_block_native')
+        self.check_blocks()
+
+    def test_partial_block(self):
+        key = bytes.fromhex(VECTORS[0][0])
+        with self.assertRaises(ValueError):
+            aes.encrypt_blocks(bytes(17), key)
+        with self.assertRaises(ValueError):
+            aes.decrypt_blocks(bytes(15), key)
+
+if __name__ == '__main__':
+    unittest.main()
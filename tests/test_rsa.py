@@ -0,0 +1,33 @@
+# Tests for the RSA cryptosystem.
+#
+# Run from the repository root with:
+#     python -m unittest discover tests
+
+import unittest
+
+import src.rsa as rsa
+
+MESSAGE = b'Hello, RSA!'
+
+class TestRsa(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.key_pair = rsa.generate_keypair(bits=512)
+
+    def test_decrypt_crt_matches_decrypt(self):
+        ciphertext = rsa.encrypt(self.key_pair.public_key, MESSAGE)
+        self.assertEqual(
+            rsa.decrypt_crt(self.key_pair.crt_private_key, ciphertext),
+            rsa.decrypt(self.key_pair.private_key, ciphertext),
+        )
+        self.assertEqual(rsa.decrypt_crt(self.key_pair.crt_private_key, ciphertext), MESSAGE)
+
+    def test_key_pair_without_primes(self):
+        kp = self.key_pair
+        key_pair = rsa.RsaKeyPair(kp.e, kp.d, kp.n)
+        self.assertIsNone(key_pair.crt_private_key)
+        ciphertext = rsa.encrypt(key_pair.public_key, MESSAGE)
+        self.assertEqual(rsa.decrypt(key_pair.private_key, ciphertext), MESSAGE)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+# Tests for the SHA-256 hash function.
+# The vectors are the SHA-256 examples from FIPS 180-4 / NIST.
+#
+# Run from the repository root with:
+#     python -m unittest discover tests
+
+import hashlib
+import unittest
+from unittest import mock
+
+import src.sha256 as sha256
+
+# (message, expected digest)
+VECTORS = [
+    ('',
+     'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855'),
+    ('abc',
+     'ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad'),
+    ('abcdbcdecdefdefgefghfghighijhijkijkljklmklmnlmnomnopnopq',
+     '248d6a61d20638b8e5c026930c3e6039a33ce45964ff2167f6ecedd419db06c1'),
+]
+
+# Message lengths around the point where the padding spills into a second
+# chunk (55/56 bytes) and around whole chunks (63/64/65, 119/120)
+BOUNDARY_LENGTHS = [55, 56, 63, 64, 65, 119, 120]
+
+class TestSha256(unittest.TestCase):
+    def test_known_answer(self):
+        for message, digest in VECTORS:
+            with self.subTest(message=message):
+                self.assertEqual(sha256.hash(message), digest)
+
+    def test_padding_boundaries(self):
+        for length in BOUNDARY_LENGTHS:
+            message = ''.join(chr(ord('a') + i % 26) for i in range(length))
+            with self.subTest(length=length):
+                self.assertEqual(
+                    sha256.hash(message),
+                    hashlib.sha256(message.encode('utf-8')).hexdigest(),
+                )
+
+class TestSha256Python(TestSha256):
+    """The same tests with the native extension disabled, if it is built."""
+    def setUp(self):
+        patcher = mock.patch.object(sha256, '_process_chunks_native', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+if __name__ == '__main__':
+    unittest.main()